@@ -4,12 +4,17 @@ build_component_library.py - Build complete component and font library
 Creates JSON library with lamp pen commands for all SVG assets
 """
 
+import os
 import sys
 import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
+# Bytes read from the start of each file when checking it is an SVG
+SVG_SNIFF_BYTES = 64 * 1024
+
 def svg_to_lamp_commands(svg_path: Path, scale: int = 1, x: int = 0, y: int = 0, tolerance: float = 1.0) -> List[str]:
     """Convert SVG to lamp pen commands using svg_to_lamp.sh"""
     script_dir = Path(__file__).parent
@@ -37,24 +42,60 @@ def svg_to_lamp_commands(svg_path: Path, scale: int = 1, x: int = 0, y: int = 0,
         print(f"Error converting {svg_path.name}: {e.stderr}", file=sys.stderr)
         return []
 
+def is_svg_file(svg_path: Path) -> bool:
+    """Cheap check for empty, unreadable or non-SVG files before spawning a converter"""
+    try:
+        if svg_path.stat().st_size < 32:
+            return False
+        
+        # Wide enough to get past long comment or DOCTYPE headers
+        with open(svg_path, 'rb') as f:
+            head = f.read(SVG_SNIFF_BYTES)
+    except OSError:
+        return False
+    
+    return b'<svg' in head or b'<?xml' in head
+
+def find_svg_files(directory: Path) -> List[Path]:
+    """List SVG files in directory, skipping empty or degenerate ones"""
+    svg_files = []
+    
+    for svg_file in sorted(directory.glob("*.svg")):
+        if is_svg_file(svg_file):
+            svg_files.append(svg_file)
+        else:
+            print(f"Warning: Skipping empty or invalid SVG: {svg_file.name}", file=sys.stderr)
+    
+    return svg_files
+
+def convert_svg_files(svg_files: List[Path], tolerance: float):
+    """Convert SVG files concurrently, yielding command lists in input order"""
+    # Each conversion runs in its own svg_to_lamp.sh subprocess, so threads
+    # are enough to keep every core busy
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        yield from pool.map(
+            lambda svg_file: svg_to_lamp_commands(svg_file, scale=1, tolerance=tolerance),
+            svg_files
+        )
+
 def build_component_library(components_dir: Path) -> Dict:
     """Build library from components directory"""
     library = {}
     
-    svg_files = sorted(components_dir.glob("*.svg"))
+    svg_files = find_svg_files(components_dir)
     if not svg_files:
         print(f"Warning: No SVG files found in {components_dir}", file=sys.stderr)
         return library
     
     print(f"Processing {len(svg_files)} component SVG files...")
     
-    for svg_file in svg_files:
+    # Convert at unit scale for relative coordinates
+    results = convert_svg_files(svg_files, tolerance=1.0)
+    
+    for svg_file, commands in zip(svg_files, results):
         component_name = svg_file.stem
         print(f"  {component_name}...", end=" ", flush=True)
         
-        # Convert at unit scale for relative coordinates
-        commands = svg_to_lamp_commands(svg_file, scale=1, tolerance=1.0)
-        
         if commands:
             library[component_name] = {
                 "type": "component",
@@ -72,14 +113,17 @@ def build_font_library(font_dir: Path) -> Dict:
     """Build library from font directory"""
     library = {}
     
-    svg_files = sorted(font_dir.glob("*.svg"))
+    svg_files = find_svg_files(font_dir)
     if not svg_files:
         print(f"Warning: No SVG files found in {font_dir}", file=sys.stderr)
         return library
     
     print(f"Processing {len(svg_files)} font glyph SVG files...")
     
-    for svg_file in svg_files:
+    # Convert at unit scale for relative coordinates
+    results = convert_svg_files(svg_files, tolerance=1.5)
+    
+    for svg_file, commands in zip(svg_files, results):
         # Extract character from filename
         # Format: "segoe path_X.svg" where X is the character
         stem = svg_file.stem
@@ -90,9 +134,6 @@ def build_font_library(font_dir: Path) -> Dict:
         
         print(f"  '{char}'...", end=" ", flush=True)
         
-        # Convert at unit scale for relative coordinates
-        commands = svg_to_lamp_commands(svg_file, scale=1, tolerance=1.5)
-        
         if commands:
             library[char] = {
                 "type": "glyph",
@@ -145,6 +186,8 @@ def main():
     library = {
         "components": components,
         "font": font,
+        # Palette order, sorted here so the controller skips it at runtime
+        "component_order": sorted(components),
         "stats": {
             "component_count": len(components),
             "glyph_count": len(font),
@@ -91,6 +91,12 @@ scp -q "$SRC_DIR/symbol_ui_controller.py" root@$RM2_IP:/opt/bin/symbol_ui_contro
 ssh root@$RM2_IP "chmod +x /opt/bin/symbol_ui_controller"
 echo -e "${GREEN}✓ symbol_ui_controller${NC}"
 
+echo -e "${BLUE}Deploying controller daemon...${NC}"
+ssh root@$RM2_IP "mkdir -p /opt/lib/symbol_ui"
+scp -q "$SRC_DIR/symbol_ui_controller.py" "$SRC_DIR/symbol_ui_daemon.py" root@$RM2_IP:/opt/lib/symbol_ui/
+ssh root@$RM2_IP "chmod +x /opt/lib/symbol_ui/symbol_ui_daemon.py"
+echo -e "${GREEN}✓ symbol_ui_daemon${NC}"
+
 echo -e "${BLUE}Deploying gesture configs...${NC}"
 scp -q "$CONFIG_DIR/symbol_ui_activation.conf" root@$RM2_IP:/opt/etc/
 scp -q "$CONFIG_DIR/symbol_ui_main.conf" root@$RM2_IP:/opt/etc/
@@ -122,9 +128,13 @@ echo ""
 echo -e "${BLUE}Deploying service files...${NC}"
 scp -q "$SERVICE_DIR/symbol_ui_activation.service" root@$RM2_IP:/etc/systemd/system/
 scp -q "$SERVICE_DIR/symbol_ui_main.service" root@$RM2_IP:/etc/systemd/system/
+scp -q "$SERVICE_DIR/symbol_ui_daemon.service" root@$RM2_IP:/etc/systemd/system/
+scp -q "$SERVICE_DIR/symbol_ui_daemon.socket" root@$RM2_IP:/etc/systemd/system/
 
 echo -e "${BLUE}Enabling services...${NC}"
 ssh root@$RM2_IP "systemctl daemon-reload"
+# Resident daemon holds the old library and code in memory; restart it if running
+ssh root@$RM2_IP "systemctl try-restart symbol_ui_daemon.service"
 ssh root@$RM2_IP "systemctl enable symbol_ui_activation.service"
 ssh root@$RM2_IP "systemctl start symbol_ui_activation.service"
 
@@ -157,10 +167,13 @@ echo -e "${BLUE}Checking installed files:${NC}"
 check_file "/opt/etc/symbol_library.json"
 check_file "/opt/bin/symbol_ui_mode"
 check_file "/opt/bin/symbol_ui_controller"
+check_file "/opt/lib/symbol_ui/symbol_ui_daemon.py"
 check_file "/opt/etc/symbol_ui_activation.conf"
 check_file "/opt/etc/symbol_ui_main.conf"
 check_file "/etc/systemd/system/symbol_ui_activation.service"
 check_file "/etc/systemd/system/symbol_ui_main.service"
+check_file "/etc/systemd/system/symbol_ui_daemon.service"
+check_file "/etc/systemd/system/symbol_ui_daemon.socket"
 
 echo ""
 
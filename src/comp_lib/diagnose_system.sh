@@ -121,8 +121,10 @@ else
     echo "  Component Mode: INACTIVE (normal)"
 fi
 
-if ssh root@$RM2_IP "test -f /home/root/.symbol_ui_state.json"; then
+if ssh root@$RM2_IP "test -f /home/root/.symbol_ui_state.pkl"; then
     echo "✓ State file exists"
+elif ssh root@$RM2_IP "test -f /home/root/.symbol_ui_state.json"; then
+    echo "✓ State file exists (legacy JSON, migrated on next save)"
 else
     echo "  State file: Not created yet (normal)"
 fi
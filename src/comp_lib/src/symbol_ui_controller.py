@@ -5,13 +5,26 @@ Manages UI state, renders palette, handles gestures, generates lamp commands
 Updated with conflict-free zones and gestures
 """
 
+import io
 import sys
 import json
 import os
+import pickle
+import logging
+import atexit
+import shutil
+import socket
+import threading
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
 from dataclasses import dataclass, field
 
+# Silent unless a handler is configured (LAMP_DEBUG=1 or the daemon)
+log = logging.getLogger("symbol_ui")
+log.addHandler(logging.NullHandler())
+
 # Screen dimensions for reMarkable 2
 SCREEN_WIDTH = 1404
 SCREEN_HEIGHT = 1872
@@ -33,6 +46,87 @@ UI_VISIBLE_ITEMS = 16
 UI_TEXT_SCALE = 4
 UI_MARGIN = 30
 
+# Coalesce state writes from bursts of gestures (seconds)
+STATE_SAVE_DELAY = 0.2
+
+# Placements kept in state history; older ones are dropped
+HISTORY_LIMIT = 256
+
+# Socket of the resident controller, held by symbol_ui_daemon.socket
+DAEMON_SOCKET = "/run/symbol_ui.sock"
+
+# Seconds a gesture waits to connect to and send to the daemon, and then
+# for its reply. The reply budget also covers a socket-activated cold start
+# (interpreter, library load and parse) on the device's slow CPU
+DAEMON_TIMEOUT = 2.0
+DAEMON_REPLY_TIMEOUT = 15.0
+
+# Gesture commands accepted from the CLI and the daemon socket
+COMMANDS = (
+    "toggle_palette", "scroll_up", "scroll_down", "select_component",
+    "place_component", "cancel_selection", "clear_screen",
+    "scale_up", "scale_down", "rotate_cw", "rotate_ccw",
+)
+
+# Gesture environment the CLI client forwards to the daemon
+FORWARDED_ENV = ("TAP_X", "TAP_Y")
+
+def _fmt_point(op: str, x: int, y: int, px: int, py: int) -> str:
+    return f"pen {op} {px + x} {py + y}\n"
+
+def _fmt_circle(op: str, x: int, y: int, cx: int, cy: int, r: int) -> str:
+    return f"pen circle {cx + x} {cy + y} {r}\n"
+
+def _fmt_segment(op: str, x: int, y: int, x1: int, y1: int, x2: int, y2: int) -> str:
+    return f"pen {op} {x1 + x} {y1 + y} {x2 + x} {y2 + y}\n"
+
+def _fmt_up(op: str, x: int, y: int) -> str:
+    return "pen up\n"
+
+# Pen operations: coordinate count and formatter taking (op, x, y, *coords)
+# and returning a newline-terminated lamp command
+OP_TABLE: Dict[str, Tuple[int, Callable[..., str]]] = {
+    "down": (2, _fmt_point),
+    "move": (2, _fmt_point),
+    "circle": (3, _fmt_circle),
+    "line": (4, _fmt_segment),
+    "rectangle": (4, _fmt_segment),
+    "up": (0, _fmt_up),
+}
+
+def parse_commands(commands: List[str]) -> List[Tuple]:
+    """Parse lamp pen command strings into (op, *coords) tuples with coordinates in hundredths"""
+    parsed = []
+    
+    for cmd in commands:
+        parts = cmd.split()
+        if len(parts) < 2 or parts[0] != "pen" or parts[1] not in OP_TABLE:
+            continue
+        
+        op = parts[1]
+        arity = OP_TABLE[op][0]
+        if len(parts) < 2 + arity:
+            continue
+        
+        # Skip a malformed line rather than failing the whole library load
+        try:
+            coords = tuple(round(float(v) * 100) for v in parts[2:2 + arity])
+        except (ValueError, OverflowError):
+            log.warning("Skipping malformed lamp command: %s", cmd)
+            continue
+        parsed.append((op, *coords))
+    
+    return parsed
+
+def scale_commands(parsed: List[Tuple], scale_pct: int) -> Tuple[Tuple, ...]:
+    """Scale parsed pen commands about the origin in integer math, flooring to whole pixels"""
+    return tuple((op, *(v * scale_pct // 10000 for v in args)) for op, *args in parsed)
+
+def translate_commands(out: TextIO, scaled: Tuple[Tuple, ...], x: int, y: int):
+    """Translate scaled pen commands to (x, y) and write them to out as lamp command lines"""
+    for op, *args in scaled:
+        out.write(OP_TABLE[op][1](op, x, y, *args))
+
 @dataclass
 class UIState:
     """UI state management"""
@@ -40,8 +134,8 @@ class UIState:
     selected_component: Optional[str] = None
     scroll_offset: int = 0
     rotation: int = 0  # 0, 90, 180, 270
-    scale: float = 1.0
-    history: List[Dict] = field(default_factory=list)
+    scale_pct: int = 100  # 25-300 in steps of 25
+    history: Deque[Dict] = field(default_factory=lambda: deque(maxlen=HISTORY_LIMIT))
     component_list: List[str] = field(default_factory=list)
 
 class SymbolUIController:
@@ -51,71 +145,141 @@ class SymbolUIController:
         self.state = self.load_state()
         self.library = self.load_library()
         
-        # Build component list
+        # Stream lamp commands are written to and gesture environment;
+        # stdout and os.environ unless the daemon substitutes the client's
+        self.output: Optional[TextIO] = None
+        self.environ: Optional[Dict[str, str]] = None
+        
+        # Rendered palette text keyed by the state it depends on, and label
+        # glyph text keyed by (component, visible row)
+        self._palette_cache: Optional[Tuple[Tuple, str]] = None
+        self._label_cache: Dict[Tuple[str, int], str] = {}
+        
+        # Library entries scaled about the origin, keyed by
+        # (section, name, scale in percent); callers only translate
+        self._scaled_commands = lru_cache(maxsize=128)(self._scale_entry)
+        
+        # Deferred state persistence: the latest unsaved snapshot, written
+        # by timer or at exit
+        self._pending_state: Optional[Dict] = None
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        atexit.register(self._flush_if_dirty)
+        
+        # Build component list, presorted by the library builder
         if self.library and "components" in self.library:
-            self.state.component_list = sorted(self.library["components"].keys())
+            component_order = self.library.get("component_order")
+            if component_order is None:
+                log.warning("Library has no component_order, sorting at load")
+                component_order = sorted(self.library["components"].keys())
+            self.state.component_list = component_order
     
     def load_library(self) -> Dict:
         """Load component library"""
         if not self.library_path.exists():
-            print(f"Error: Library not found: {self.library_path}", file=sys.stderr)
+            log.error("Library not found: %s", self.library_path)
             return {}
         
         try:
             with open(self.library_path, 'r') as f:
-                return json.load(f)
+                library = json.load(f)
         except Exception as e:
-            print(f"Error loading library: {e}", file=sys.stderr)
+            log.error("Error loading library: %s", e)
             return {}
+        
+        # Parse pen commands once so rendering only scales and translates
+        for section in ("font", "components"):
+            for entry in library.get(section, {}).values():
+                entry["parsed"] = parse_commands(entry.get("commands", []))
+        
+        return library
     
     def load_state(self) -> UIState:
         """Load UI state from file"""
-        if self.state_file.exists():
+        state_file = self.state_file
+        if not state_file.exists():
+            # Fall back to the JSON state written by older versions
+            state_file = self.state_file.with_suffix(".json")
+        
+        if state_file.exists():
             try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    state = UIState()
-                    state.palette_visible = data.get("palette_visible", False)
-                    state.selected_component = data.get("selected_component")
-                    state.scroll_offset = data.get("scroll_offset", 0)
-                    state.rotation = data.get("rotation", 0)
-                    state.scale = data.get("scale", 1.0)
-                    state.history = data.get("history", [])
-                    return state
+                with open(state_file, 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw) if raw.startswith(b"{") else pickle.loads(raw)
+                state = UIState()
+                state.palette_visible = data.get("palette_visible", False)
+                state.selected_component = data.get("selected_component")
+                state.scroll_offset = data.get("scroll_offset", 0)
+                state.rotation = data.get("rotation", 0)
+                # Older state stored a float "scale" factor
+                state.scale_pct = data.get("scale_pct", round(data.get("scale", 1.0) * 100))
+                state.history = deque(data.get("history", []), maxlen=HISTORY_LIMIT)
+                return state
             except Exception as e:
-                print(f"Warning: Failed to load state: {e}", file=sys.stderr)
+                log.warning("Failed to load state: %s", e)
         
         return UIState()
     
-    def save_state(self):
-        """Save UI state to file"""
-        data = {
+    def _state_snapshot(self) -> Dict:
+        """Copy of the persisted state fields, safe to save from another thread"""
+        return {
             "palette_visible": self.state.palette_visible,
             "selected_component": self.state.selected_component,
             "scroll_offset": self.state.scroll_offset,
             "rotation": self.state.rotation,
-            "scale": self.state.scale,
-            "history": self.state.history
+            "scale_pct": self.state.scale_pct,
+            "history": list(self.state.history)
         }
+    
+    def save_state(self, data: Optional[Dict] = None):
+        """Save UI state to file, snapshotting the current state if none is given"""
+        if data is None:
+            data = self._state_snapshot()
         
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(self.state_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception as e:
-            print(f"Warning: Failed to save state: {e}", file=sys.stderr)
+            log.warning("Failed to save state: %s", e)
     
-    def send_lamp_commands(self, commands: List[str]):
-        """Send commands to lamp via stdout"""
-        for cmd in commands:
-            print(cmd)
-        sys.stdout.flush()
+    def _scale_entry(self, section: str, name: str, scale_pct: int) -> Tuple[Tuple, ...]:
+        """Scale a library entry's parsed commands"""
+        return scale_commands(self.library[section][name]["parsed"], scale_pct)
     
-    def render_text(self, text: str, x: int, y: int, scale: int = 4) -> List[str]:
-        """Generate lamp commands to render text using font glyphs"""
-        commands = []
-        
+    def _mark_dirty(self):
+        """Schedule a state save, restarting the delay on every change"""
+        # Snapshot on the thread that changed the state, so the timer thread
+        # never reads state while a later action is modifying it
+        snapshot = self._state_snapshot()
+        with self._save_lock:
+            self._pending_state = snapshot
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(STATE_SAVE_DELAY, self._flush_if_dirty)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_if_dirty(self):
+        """Save the pending snapshot now if state changed since the last save"""
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._pending_state is not None:
+                data, self._pending_state = self._pending_state, None
+                self.save_state(data)
+    
+    def send_lamp_commands(self, commands: str):
+        """Send newline-terminated lamp commands to stdout in one write"""
+        output = self.output or sys.stdout
+        if commands:
+            output.write(commands)
+        output.flush()
+    
+    def render_text(self, out: TextIO, text: str, x: int, y: int, scale: int = 4):
+        """Write lamp commands rendering text with font glyphs to out"""
         if "font" not in self.library:
-            return commands
+            return
         
         font = self.library["font"]
         cursor_x = x
@@ -128,56 +292,29 @@ class SymbolUIController:
             
             if char not in font:
                 # Try to handle common symbols
+                log.debug("No glyph for %r, leaving a gap", char)
                 cursor_x += glyph_spacing
                 continue
             
-            glyph = font[char]
-            
-            # Scale and translate glyph commands
-            for cmd in glyph["commands"]:
-                parts = cmd.split()
-                
-                if len(parts) >= 4 and parts[0] == "pen" and parts[1] in ["down", "move"]:
-                    px = int(float(parts[2]) * scale) + cursor_x
-                    py = int(float(parts[3]) * scale) + y
-                    commands.append(f"pen {parts[1]} {px} {py}")
-                
-                elif len(parts) >= 5 and parts[0] == "pen" and parts[1] == "circle":
-                    cx = int(float(parts[2]) * scale) + cursor_x
-                    cy = int(float(parts[3]) * scale) + y
-                    r = int(float(parts[4]) * scale)
-                    commands.append(f"pen circle {cx} {cy} {r}")
-                
-                elif len(parts) >= 6 and parts[0] == "pen" and parts[1] == "line":
-                    x1 = int(float(parts[2]) * scale) + cursor_x
-                    y1 = int(float(parts[3]) * scale) + y
-                    x2 = int(float(parts[4]) * scale) + cursor_x
-                    y2 = int(float(parts[5]) * scale) + y
-                    commands.append(f"pen line {x1} {y1} {x2} {y2}")
-                
-                elif len(parts) >= 6 and parts[0] == "pen" and parts[1] == "rectangle":
-                    x1 = int(float(parts[2]) * scale) + cursor_x
-                    y1 = int(float(parts[3]) * scale) + y
-                    x2 = int(float(parts[4]) * scale) + cursor_x
-                    y2 = int(float(parts[5]) * scale) + y
-                    commands.append(f"pen rectangle {x1} {y1} {x2} {y2}")
-                
-                elif parts[0] == "pen" and parts[1] == "up":
-                    commands.append("pen up")
+            glyph = self._scaled_commands("font", char, scale * 100)
+            translate_commands(out, glyph, cursor_x, y)
             
             cursor_x += glyph_spacing
-        
-        return commands
     
-    def render_palette(self) -> List[str]:
-        """Render the component palette UI"""
-        commands = []
+    def render_palette(self, out: TextIO):
+        """Write the component palette UI to out"""
+        key = (self.state.scroll_offset, self.state.selected_component, self.state.palette_visible)
+        if self._palette_cache and self._palette_cache[0] == key:
+            out.write(self._palette_cache[1])
+            return
         
         if not self.state.palette_visible:
-            return commands
+            return
+        
+        palette = io.StringIO()
         
         # Draw panel border
-        commands.append(f"pen rectangle {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}")
+        palette.write(f"pen rectangle {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}\n")
         
         # Calculate visible range
         start_idx = self.state.scroll_offset
@@ -185,66 +322,113 @@ class SymbolUIController:
         
         # Render component list
         for i in range(start_idx, end_idx):
-            component = self.state.component_list[i]
-            y_pos = UI_PANEL_Y + UI_MARGIN + (i - start_idx) * UI_ITEM_HEIGHT
-            
-            # Highlight selected component
-            if component == self.state.selected_component:
-                highlight_x1 = UI_PANEL_X + 10
-                highlight_y1 = y_pos - 5
-                highlight_x2 = SCREEN_WIDTH - 10
-                highlight_y2 = y_pos + 70
-                commands.append(f"pen rectangle {highlight_x1} {highlight_y1} {highlight_x2} {highlight_y2}")
-            
-            # Render component name
-            text_x = UI_PANEL_X + UI_MARGIN
-            text_y = y_pos + 10
-            text_cmds = self.render_text(component, text_x, text_y, scale=UI_TEXT_SCALE)
-            commands.extend(text_cmds)
+            self._render_item(palette, i)
         
         # Draw scroll indicator if needed
-        if len(self.state.component_list) > UI_VISIBLE_ITEMS:
-            total_height = UI_PANEL_HEIGHT - 100
-            indicator_height = int((UI_VISIBLE_ITEMS / len(self.state.component_list)) * total_height)
-            indicator_y = int((self.state.scroll_offset / len(self.state.component_list)) * total_height) + 50
-            
-            indicator_x1 = SCREEN_WIDTH - 30
-            indicator_x2 = SCREEN_WIDTH - 15
-            commands.append(f"pen rectangle {indicator_x1} {indicator_y} {indicator_x2} {indicator_y + indicator_height}")
+        self._render_scroll_indicator(palette)
         
-        return commands
+        self._palette_cache = (key, palette.getvalue())
+        out.write(self._palette_cache[1])
+    
+    def _item_y(self, i: int) -> int:
+        """Top of component i's visible row"""
+        return UI_PANEL_Y + UI_MARGIN + (i - self.state.scroll_offset) * UI_ITEM_HEIGHT
+    
+    def _item_bounds(self, i: int) -> Tuple[int, int, int, int]:
+        """Highlight rectangle of component i at its visible row"""
+        y_pos = self._item_y(i)
+        return UI_PANEL_X + 10, y_pos - 5, SCREEN_WIDTH - 10, y_pos + 70
+    
+    def _render_item(self, out: TextIO, i: int):
+        """Write highlight and name of component i at its visible row to out"""
+        component = self.state.component_list[i]
+        
+        # Highlight selected component
+        if component == self.state.selected_component:
+            x1, y1, x2, y2 = self._item_bounds(i)
+            out.write(f"pen rectangle {x1} {y1} {x2} {y2}\n")
+        
+        # Render component name
+        label_key = (component, i - self.state.scroll_offset)
+        label = self._label_cache.get(label_key)
+        if label is None:
+            text_x = UI_PANEL_X + UI_MARGIN
+            text_y = self._item_y(i) + 10
+            label_out = io.StringIO()
+            self.render_text(label_out, component, text_x, text_y, scale=UI_TEXT_SCALE)
+            label = self._label_cache[label_key] = label_out.getvalue()
+        out.write(label)
+    
+    def _render_scroll_indicator(self, out: TextIO):
+        """Write the scroll position bar to out when the list overflows"""
+        if len(self.state.component_list) <= UI_VISIBLE_ITEMS:
+            return
+        
+        total_height = UI_PANEL_HEIGHT - 100
+        indicator_height = int((UI_VISIBLE_ITEMS / len(self.state.component_list)) * total_height)
+        indicator_y = int((self.state.scroll_offset / len(self.state.component_list)) * total_height) + 50
+        
+        indicator_x1 = SCREEN_WIDTH - 30
+        indicator_x2 = SCREEN_WIDTH - 15
+        out.write(f"pen rectangle {indicator_x1} {indicator_y} {indicator_x2} {indicator_y + indicator_height}\n")
+    
+    def _redraw_items(self, out: TextIO, components: List[Optional[str]]):
+        """Erase and re-render only the visible rows of the given components"""
+        if not self.state.palette_visible:
+            return
+        
+        redrawn = False
+        start_idx = self.state.scroll_offset
+        end_idx = min(start_idx + UI_VISIBLE_ITEMS, len(self.state.component_list))
+        
+        for component in dict.fromkeys(c for c in components if c):
+            if component not in self.state.component_list:
+                continue
+            i = self.state.component_list.index(component)
+            if start_idx <= i < end_idx:
+                x1, y1, x2, y2 = self._item_bounds(i)
+                out.write(f"eraser clear {x1} {y1} {x2} {y2}\n")
+                self._render_item(out, i)
+                redrawn = True
+        
+        # Row erasure crosses the scroll indicator, so restore it
+        if redrawn:
+            self._render_scroll_indicator(out)
     
     def toggle_palette(self):
         """Toggle palette visibility"""
         self.state.palette_visible = not self.state.palette_visible
+        out = io.StringIO()
         
         if self.state.palette_visible:
-            commands = self.render_palette()
+            self.render_palette(out)
         else:
             # Erase palette area
-            commands = [f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
+            out.write(f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}\n")
         
-        self.send_lamp_commands(commands)
-        self.save_state()
+        self.send_lamp_commands(out.getvalue())
+        self._mark_dirty()
     
     def scroll_up(self):
         """Scroll component list up"""
         if self.state.scroll_offset > 0:
             self.state.scroll_offset -= 1
-            commands = [f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
-            commands.extend(self.render_palette())
-            self.send_lamp_commands(commands)
-            self.save_state()
+            out = io.StringIO()
+            out.write(f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}\n")
+            self.render_palette(out)
+            self.send_lamp_commands(out.getvalue())
+            self._mark_dirty()
     
     def scroll_down(self):
         """Scroll component list down"""
         max_scroll = max(0, len(self.state.component_list) - UI_VISIBLE_ITEMS)
         if self.state.scroll_offset < max_scroll:
             self.state.scroll_offset += 1
-            commands = [f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
-            commands.extend(self.render_palette())
-            self.send_lamp_commands(commands)
-            self.save_state()
+            out = io.StringIO()
+            out.write(f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}\n")
+            self.render_palette(out)
+            self.send_lamp_commands(out.getvalue())
+            self._mark_dirty()
     
     def select_component(self):
         """Select currently highlighted component"""
@@ -253,11 +437,15 @@ class SymbolUIController:
         
         idx = self.state.scroll_offset
         if idx < len(self.state.component_list):
+            previous = self.state.selected_component
             self.state.selected_component = self.state.component_list[idx]
-            commands = [f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
-            commands.extend(self.render_palette())
-            self.send_lamp_commands(commands)
-            self.save_state()
+            
+            # Only the old and new highlighted rows change
+            if previous != self.state.selected_component:
+                out = io.StringIO()
+                self._redraw_items(out, [previous, self.state.selected_component])
+                self.send_lamp_commands(out.getvalue())
+            self._mark_dirty()
     
     def place_component(self):
         """Place selected component at tap location"""
@@ -265,96 +453,112 @@ class SymbolUIController:
             return
         
         # Get tap coordinates from environment
-        x = int(os.environ.get("TAP_X", 500))
-        y = int(os.environ.get("TAP_Y", 500))
+        environ = os.environ if self.environ is None else self.environ
+        x = int(environ.get("TAP_X", 500))
+        y = int(environ.get("TAP_Y", 500))
         
-        component = self.library["components"].get(self.state.selected_component)
-        if not component:
+        if self.state.selected_component not in self.library.get("components", {}):
+            log.warning("Selected component not in library: %s", self.state.selected_component)
             return
         
         # Transform and place component
-        commands = []
-        scale = self.state.scale
-        
-        for cmd in component["commands"]:
-            parts = cmd.split()
-            
-            if len(parts) >= 4 and parts[0] == "pen" and parts[1] in ["down", "move"]:
-                px = int(float(parts[2]) * scale) + x
-                py = int(float(parts[3]) * scale) + y
-                commands.append(f"pen {parts[1]} {px} {py}")
-            
-            elif len(parts) >= 5 and parts[0] == "pen" and parts[1] == "circle":
-                cx = int(float(parts[2]) * scale) + x
-                cy = int(float(parts[3]) * scale) + y
-                r = int(float(parts[4]) * scale)
-                commands.append(f"pen circle {cx} {cy} {r}")
-            
-            elif len(parts) >= 6 and parts[0] == "pen" and parts[1] == "line":
-                x1 = int(float(parts[2]) * scale) + x
-                y1 = int(float(parts[3]) * scale) + y
-                x2 = int(float(parts[4]) * scale) + x
-                y2 = int(float(parts[5]) * scale) + y
-                commands.append(f"pen line {x1} {y1} {x2} {y2}")
-            
-            elif len(parts) >= 6 and parts[0] == "pen" and parts[1] == "rectangle":
-                x1 = int(float(parts[2]) * scale) + x
-                y1 = int(float(parts[3]) * scale) + y
-                x2 = int(float(parts[4]) * scale) + x
-                y2 = int(float(parts[5]) * scale) + y
-                commands.append(f"pen rectangle {x1} {y1} {x2} {y2}")
-            
-            elif parts[0] == "pen" and parts[1] == "up":
-                commands.append("pen up")
+        scaled = self._scaled_commands("components", self.state.selected_component,
+                                       self.state.scale_pct)
+        out = io.StringIO()
+        translate_commands(out, scaled, x, y)
         
         # Save to history
         self.state.history.append({
             "component": self.state.selected_component,
             "x": x,
             "y": y,
-            "scale": self.state.scale,
+            "scale_pct": self.state.scale_pct,
             "rotation": self.state.rotation
         })
         
-        self.send_lamp_commands(commands)
-        self.save_state()
+        self.send_lamp_commands(out.getvalue())
+        self._mark_dirty()
     
     def cancel_selection(self):
         """Cancel current selection"""
+        previous = self.state.selected_component
         self.state.selected_component = None
-        commands = [f"eraser clear {UI_PANEL_X} {UI_PANEL_Y} {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
-        commands.extend(self.render_palette())
-        self.send_lamp_commands(commands)
-        self.save_state()
+        
+        # Only the previously highlighted row changes
+        out = io.StringIO()
+        self._redraw_items(out, [previous])
+        self.send_lamp_commands(out.getvalue())
+        self._mark_dirty()
     
     def clear_screen(self):
         """Clear entire screen"""
-        commands = [f"eraser clear 0 0 {SCREEN_WIDTH} {SCREEN_HEIGHT}"]
-        self.state.history = []
-        self.send_lamp_commands(commands)
-        self.save_state()
+        self.state.history.clear()
+        self.send_lamp_commands(f"eraser clear 0 0 {SCREEN_WIDTH} {SCREEN_HEIGHT}\n")
+        self._mark_dirty()
     
     def scale_up(self):
         """Increase scale factor"""
-        self.state.scale = min(3.0, self.state.scale + 0.25)
-        self.save_state()
+        self.state.scale_pct = min(300, self.state.scale_pct + 25)
+        self._mark_dirty()
     
     def scale_down(self):
         """Decrease scale factor"""
-        self.state.scale = max(0.25, self.state.scale - 0.25)
-        self.save_state()
+        self.state.scale_pct = max(25, self.state.scale_pct - 25)
+        self._mark_dirty()
     
     def rotate_cw(self):
         """Rotate 90° clockwise"""
         self.state.rotation = (self.state.rotation + 90) % 360
-        self.save_state()
+        self._mark_dirty()
     
     def rotate_ccw(self):
         """Rotate 90° counter-clockwise"""
         self.state.rotation = (self.state.rotation - 90) % 360
-        self.save_state()
+        self._mark_dirty()
+
+def run_in_daemon(command: str) -> Optional[bool]:
+    """Run command in the resident daemon and relay its lamp commands to stdout
+    
+    Returns None when no daemon is listening, otherwise whether it succeeded.
+    A daemon that stops answering fails the gesture rather than hanging it.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_TIMEOUT)
+        try:
+            sock.connect(DAEMON_SOCKET)
+        except OSError as e:
+            log.info("Daemon unavailable, running in-process: %s", e)
+            return None
+        
+        try:
+            # Command line carries the gesture environment as KEY=VALUE words
+            request = [command] + [f"{key}={os.environ[key]}" for key in FORWARDED_ENV if key in os.environ]
+            sock.sendall(" ".join(request).encode() + b"\n")
+            reply = sock.makefile("rb")
+            
+            # First line is the status, the rest is lamp commands sent
+            # right behind it
+            sock.settimeout(DAEMON_REPLY_TIMEOUT)
+            status = reply.readline().decode().strip()
+            sock.settimeout(DAEMON_TIMEOUT)
+            if status != "OK":
+                print(f"Error: {status[4:] or 'No reply from daemon'}", file=sys.stderr)
+                return False
+            
+            shutil.copyfileobj(reply, sys.stdout.buffer)
+        except OSError as e:
+            # Includes socket.timeout; the command may already have run, so
+            # don't retry it in-process
+            print(f"Error: Daemon did not respond: {e}", file=sys.stderr)
+            return False
+        
+        sys.stdout.flush()
+        return True
 
 def main():
+    if os.environ.get("LAMP_DEBUG") == "1":
+        logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
+    
     if len(sys.argv) < 2:
         print("Usage: symbol_ui_controller <command>", file=sys.stderr)
         print("\nCommands:", file=sys.stderr)
@@ -364,20 +568,23 @@ def main():
         sys.exit(1)
     
     command = sys.argv[1]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Prefer the resident daemon, which already has library and state loaded
+    result = run_in_daemon(command)
+    if result is not None:
+        sys.exit(0 if result else 1)
     
     # Paths
     library_path = Path("/opt/etc/symbol_library.json")
-    state_file = Path("/home/root/.symbol_ui_state.json")
+    state_file = Path("/home/root/.symbol_ui_state.pkl")
     
     controller = SymbolUIController(library_path, state_file)
     
     # Execute command
-    if hasattr(controller, command):
-        method = getattr(controller, command)
-        method()
-    else:
-        print(f"Error: Unknown command: {command}", file=sys.stderr)
-        sys.exit(1)
+    getattr(controller, command)()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+symbol_ui_daemon.py - Resident symbol palette controller
+Keeps one SymbolUIController in memory and serves gesture commands over a
+Unix socket, so gestures skip interpreter startup and library parsing
+"""
+
+import io
+import os
+import logging
+import sys
+import select
+import signal
+import socket
+import socketserver
+from pathlib import Path
+from typing import Optional
+
+from symbol_ui_controller import COMMANDS, DAEMON_SOCKET, DAEMON_TIMEOUT, SymbolUIController, log
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """Run one gesture command and reply with its lamp commands
+
+    Request is the command followed by KEY=VALUE gesture environment words,
+    reply is a status line ("OK" or "ERR <message>") followed by the
+    lamp commands the controller produced
+    """
+
+    # A client that connects but never sends must not stall later gestures
+    timeout = DAEMON_TIMEOUT
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except socket.timeout:
+            log.warning("Client sent no command within %ss", self.timeout)
+            return
+
+        command, *assignments = line.decode().split() or [""]
+        controller = self.server.controller
+
+        if command not in COMMANDS:
+            self.wfile.write(f"ERR Unknown command: {command}\n".encode())
+            return
+
+        # Running a command nobody will draw would leave state and screen
+        # out of step, e.g. a toggled palette that never appeared
+        if self.client_gone():
+            log.warning("Client left before %s ran, skipping", command)
+            return
+
+        output = io.StringIO()
+        controller.output = output
+        controller.environ = dict(word.split("=", 1) for word in assignments if "=" in word)
+        try:
+            getattr(controller, command)()
+        except Exception as e:
+            log.error("%s failed: %s", command, e)
+            self.wfile.write(f"ERR {command} failed: {e}\n".encode())
+            return
+        finally:
+            controller.output = None
+            controller.environ = None
+
+        self.wfile.write(b"OK\n" + output.getvalue().encode())
+
+    def client_gone(self) -> bool:
+        """True if the client closed its end while the request was queued"""
+        # A live client has sent its line and is waiting, so the socket only
+        # turns readable once it closes (EOF) or resets
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+# First file descriptor passed by systemd socket activation
+SD_LISTEN_FDS_START = 3
+
+class ControllerServer(socketserver.UnixStreamServer):
+    """Unix socket server owning the shared controller
+
+    Requests are handled one at a time, so gestures never interleave.
+    Under symbol_ui_daemon.socket systemd passes the listening socket in;
+    run by hand, the server binds the path itself.
+    """
+
+    def __init__(self, socket_path: str):
+        self.activated = (os.environ.get("LISTEN_PID") == str(os.getpid())
+                          and os.environ.get("LISTEN_FDS") == "1")
+        self.controller: Optional[SymbolUIController] = None
+
+        if self.activated:
+            super().__init__(socket_path, CommandHandler, bind_and_activate=False)
+            self.socket.close()
+            self.socket = socket.socket(fileno=SD_LISTEN_FDS_START)
+        else:
+            # Remove socket left behind by an unclean shutdown
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            super().__init__(socket_path, CommandHandler)
+
+def main():
+    # Running as a service, so always log to the journal
+    level = logging.DEBUG if os.environ.get("LAMP_DEBUG") == "1" else logging.INFO
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
+
+    # Paths
+    library_path = Path("/opt/etc/symbol_library.json")
+    state_file = Path("/home/root/.symbol_ui_state.pkl")
+
+    # Listen before loading so gestures queue on the socket instead of
+    # falling back to in-process runs whose state this daemon would overwrite
+    server = ControllerServer(DAEMON_SOCKET)
+    server.controller = SymbolUIController(library_path, state_file)
+
+    # Turn systemctl stop into a normal exit so pending state is saved
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    log.info("Listening on %s", DAEMON_SOCKET)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # An activated socket belongs to systemd and stays for the next start
+        if not server.activated:
+            Path(DAEMON_SOCKET).unlink(missing_ok=True)
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ Shows visual indicator, starts/stops services
 """
 
 import sys
+import atexit
 import subprocess
 from pathlib import Path
 
@@ -20,17 +21,39 @@ INDICATOR_Y1 = 1838
 INDICATOR_X2 = 1404
 INDICATOR_Y2 = 1872
 
-def run_lamp_command(commands):
-    """Send commands to lamp"""
-    try:
-        proc = subprocess.Popen(
+# Lamp process shared by every draw in this invocation
+_lamp_proc = None
+
+def get_lamp():
+    """Start lamp on first use and reuse its stdin pipe afterwards"""
+    global _lamp_proc
+    if _lamp_proc is None or _lamp_proc.poll() is not None:
+        _lamp_proc = subprocess.Popen(
             [LAMP_BIN],
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             text=True
         )
-        proc.communicate(input=commands)
+    return _lamp_proc
+
+def close_lamp():
+    """Close the lamp pipe and wait for queued commands to be drawn"""
+    if _lamp_proc is not None and _lamp_proc.poll() is None:
+        try:
+            _lamp_proc.stdin.close()
+            _lamp_proc.wait()
+        except Exception as e:
+            print(f"Warning: Failed to close lamp: {e}", file=sys.stderr)
+
+atexit.register(close_lamp)
+
+def run_lamp_command(commands):
+    """Send commands to lamp"""
+    try:
+        proc = get_lamp()
+        proc.stdin.write(commands)
+        proc.stdin.flush()
     except Exception as e:
         print(f"Warning: Lamp command failed: {e}", file=sys.stderr)
 
@@ -18,6 +18,9 @@ import math
 SCREEN_WIDTH = 1404
 SCREEN_HEIGHT = 1872
 
+# Numbers in polyline/polygon "points" attributes
+NUMBER_RE = re.compile(r'-?\d*\.?\d+')
+
 def is_collinear(p1, p2, p3, tolerance=1e-3):
     """Check if three points are collinear (on same straight line)"""
     x1, y1 = p1
@@ -110,12 +113,15 @@ def transform_point(x, y, scale, offset_x, offset_y, shift_x=0, shift_y=0):
     ty = max(0, min(ty, SCREEN_HEIGHT - 1))
     return tx, ty
 
-def extract_pins(root):
+def walk_elements(root):
+    """Walk the SVG tree once, returning (local tag, element) pairs in document order"""
+    return [(elem.tag.split('}')[-1], elem) for elem in root.iter()]
+
+def extract_pins(elements):
     """Extract pin information from SVG"""
     pins = []
     
-    for elem in root.iter():
-        tag = elem.tag.split('}')[-1]
+    for tag, elem in elements:
         if tag == 'circle':
             elem_id = elem.get('id', '')
             if 'pin' in elem_id.lower():
@@ -132,14 +138,12 @@ def extract_pins(root):
     
     return pins
 
-def collect_bounds(root):
+def collect_bounds(elements):
     """Quick bounds calculation"""
     minx = float('inf'); miny = float('inf')
     maxx = float('-inf'); maxy = float('-inf')
     
-    for elem in root.iter():
-        tag = elem.tag.split('}')[-1]
-        
+    for tag, elem in elements:
         if tag == 'path':
             d = elem.get('d', '')
             if not d:
@@ -171,7 +175,7 @@ def collect_bounds(root):
             miny = min(miny, y1, y2); maxy = max(maxy, y1, y2)
         
         elif tag in ('polyline', 'polygon'):
-            pts = [float(n) for n in re.findall(r'-?\d*\.?\d+', elem.get('points', ''))]
+            pts = [float(n) for n in NUMBER_RE.findall(elem.get('points', ''))]
             for i in range(0, len(pts), 2):
                 if i < len(pts):
                     minx = min(minx, pts[i]); maxx = max(maxx, pts[i])
@@ -222,9 +226,10 @@ def main():
     
     tree = ET.parse(svg_file)
     root = tree.getroot()
+    elements = walk_elements(root)
     
     # Extract pins first
-    pins = extract_pins(root)
+    pins = extract_pins(elements)
     if pins:
         print(f"# Found {len(pins)} pins:", file=sys.stderr)
         for pin in pins:
@@ -233,7 +238,7 @@ def main():
         print("# Warning: No pins found in SVG", file=sys.stderr)
     
     # Calculate bounds
-    minx, miny, maxx, maxy = collect_bounds(root)
+    minx, miny, maxx, maxy = collect_bounds(elements)
     if minx == float('inf'):
         print("# No drawable content found", file=sys.stderr)
         sys.exit(0)
@@ -264,8 +269,7 @@ def main():
     path_stats = []
     pin_count = 0
     
-    for elem in root.iter():
-        tag = elem.tag.split('}')[-1]
+    for tag, elem in elements:
         elem_id = elem.get('id', '')
         is_pin = 'pin' in elem_id.lower()
         
@@ -345,7 +349,7 @@ def main():
             if is_pin:
                 continue
             
-            pts = [float(n) for n in re.findall(r'-?\d*\.?\d+', elem.get('points', ''))]
+            pts = [float(n) for n in NUMBER_RE.findall(elem.get('points', ''))]
             if len(pts) >= 4:
                 x0, y0 = pts[0], pts[1]
                 tx, ty = transform_point(x0, y0, scale, offset_x, offset_y, shift_x, shift_y)